@@ -3,6 +3,7 @@
 # requires-python = ">=3.12"
 # dependencies = [
 #     "mutagen>=1.47.0",
+#     "rapidfuzz>=3.9.0",
 # ]
 # ///
 """
@@ -6,7 +6,7 @@ from pathlib import Path
 
 from .config import MUSIC_DIR
 from .db import SongDatabase, scan_music_library
-from .download import download_with_spotdl, download_with_ytdlp
+from .download import download_many, download_with_spotdl, download_with_ytdlp
 from .lastfm import (
     check_local_matches,
     get_top_tracks_by_artist,
@@ -52,6 +52,13 @@ def main():
         default=None,
         help="Output directory (default: ~/Music/{Artist})",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=4,
+        help="Number of concurrent downloads (default: 4)",
+    )
     parser.add_argument(
         "--backend",
         choices=["spotdl", "yt-dlp"],
@@ -115,6 +122,7 @@ def main():
     if args.rescan and not args.query and not args.enrich and not args.playlists:
         db = SongDatabase()
         scan_music_library(db, MUSIC_DIR, force=True)
+        db.vacuum()
         db.close()
         return
 
@@ -184,7 +192,9 @@ def main():
     print(f"\nFound {len(tracks)} tracks ({local_count} already local).")
 
     if args.dry_run or args.yes:
-        print()
+        # Build the listing once and emit a single write instead of a
+        # buffered print (and possible flush) per track
+        lines = [""]
         for i, t in enumerate(tracks, 1):
             if args.song:
                 suffix = f"- {t['artist'][:20]} ({t['playcount'] or 0:,})"
@@ -193,7 +203,8 @@ def main():
             else:
                 suffix = f"- {t['artist']}"
             local_marker = " [LOCAL]" if t["local_match"] else ""
-            print(f"  {i:2}. {t['name']:<40} {suffix}{local_marker}")
+            lines.append(f"  {i:2}. {t['name']:<40} {suffix}{local_marker}")
+        sys.stdout.write("\n".join(lines) + "\n")
         if args.dry_run:
             print("\n(Dry run - not downloading)")
             return
@@ -221,14 +232,7 @@ def main():
     # Download
     download_fn = download_with_spotdl if args.backend == "spotdl" else download_with_ytdlp
 
-    success = 0
-    failed = []
-    for i, t in enumerate(tracks, 1):
-        print(f"[{i}/{len(tracks)}] Downloading: {t['artist']} - {t['name']}")
-        if download_fn(t["artist"], t["name"], output_dir):
-            success += 1
-        else:
-            failed.append(t["name"])
+    success, failed = download_many(tracks, output_dir, download_fn, workers=args.jobs)
 
     print(f"\nDone! {success}/{len(tracks)} downloaded successfully.")
     if failed:
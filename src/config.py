@@ -10,6 +10,10 @@ LASTFM_API_URL = "https://ws.audioscrobbler.com/2.0/"
 MUSIC_DIR = Path.home() / "Music"
 DB_PATH = Path.home() / ".cache" / "fetchfm" / "songs.db"
 
+# HTTP response cache for Last.fm (charts move on timescales of days)
+HTTP_CACHE_PATH = Path.home() / ".cache" / "fetchfm" / "http.db"
+HTTP_CACHE_TTL = 24 * 3600  # seconds
+
 # Audio file extensions to scan
 AUDIO_EXTENSIONS = {".mp3", ".flac", ".m4a", ".ogg", ".opus", ".wav", ".wma"}
 
@@ -1,13 +1,26 @@
 """Local music database management."""
 
+import json
+import os
 import re
 import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
-from mutagen import File as MutagenFile
-
 from .config import AUDIO_EXTENSIONS, DB_PATH, SIMILARITY_THRESHOLD
-from .utils import normalize_text, similarity
+from .utils import normalize_text, similarity_to_many
+
+_FTS_CANDIDATES_SQL = """SELECT s.path, s.artist, s.title, s.artist_norm, s.title_norm
+    FROM songs_fts f JOIN songs s ON s.id = f.rowid
+    WHERE songs_fts MATCH ? ORDER BY rank LIMIT ?"""
+
+
+@lru_cache(maxsize=4096)
+def _fts_column_expr(column: str, text: str) -> str:
+    """Turn a normalized string into FTS5 prefix-token syntax for a column."""
+    return " OR ".join(f'{column}:"{token}"*' for token in text.split())
 
 
 class SongDatabase:
@@ -18,7 +31,30 @@ class SongDatabase:
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self.conn = sqlite3.connect(str(db_path))
         self.conn.row_factory = sqlite3.Row
+        # WAL avoids a journal fsync per transaction; NORMAL sync is safe
+        # with WAL and much faster for bulk scan writes
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.execute("PRAGMA cache_size=-65536")  # 64MB page cache
+        # INSERT OR REPLACE resolves the path UNIQUE conflict by deleting
+        # the old row; without this pragma that implicit delete skips the
+        # FTS delete trigger and leaves a dead rowid in the index
+        self.conn.execute("PRAGMA recursive_triggers=ON")
         self._init_schema()
+        # Give the query planner statistics on first run
+        has_stats = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+        ).fetchone()
+        if not has_stats:
+            self.conn.execute("ANALYZE")
+        # Dedicated cursor for match lookups; sqlite3 caches the prepared
+        # statement so repeated lookups skip SQL re-parsing
+        self._find_cursor = self.conn.cursor()
+        # Lazily-built column snapshot for bulk matching (see load_match_arrays)
+        self._match_arrays = None
+        # Exact-key lookup maps derived from it (see _exact_maps)
+        self._exact_maps_cache = None
 
     def _init_schema(self):
         self.conn.executescript("""
@@ -27,12 +63,16 @@ class SongDatabase:
                 path TEXT UNIQUE NOT NULL,
                 artist TEXT,
                 artist_norm TEXT,
+                artist_prefix TEXT,
                 title TEXT,
                 title_norm TEXT,
-                mtime REAL
+                mtime REAL,
+                content_key TEXT
             );
+            -- path is covered by its UNIQUE constraint's implicit index
             CREATE INDEX IF NOT EXISTS idx_artist_norm ON songs(artist_norm);
-            CREATE INDEX IF NOT EXISTS idx_path ON songs(path);
+            CREATE INDEX IF NOT EXISTS idx_artist_title_norm ON songs(artist_norm, title_norm);
+            CREATE INDEX IF NOT EXISTS idx_title_norm ON songs(title_norm);
 
             CREATE TABLE IF NOT EXISTS artist_tags (
                 artist_norm TEXT PRIMARY KEY,
@@ -40,8 +80,89 @@ class SongDatabase:
                 tags TEXT,
                 fetched_at REAL
             );
+
+            -- Normalized (artist, tag) pairs mirroring the JSON column, so
+            -- tag -> artists is an index lookup instead of decoding every row
+            CREATE TABLE IF NOT EXISTS artist_tag (
+                artist_norm TEXT,
+                tag_lower TEXT,
+                PRIMARY KEY (artist_norm, tag_lower)
+            );
+            CREATE INDEX IF NOT EXISTS idx_at_tag ON artist_tag(tag_lower);
         """)
+        # Backfill the join table for databases that predate it
+        if not self.conn.execute("SELECT 1 FROM artist_tag LIMIT 1").fetchone():
+            rows = self.conn.execute(
+                "SELECT artist_norm, tags FROM artist_tags WHERE tags IS NOT NULL"
+            ).fetchall()
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO artist_tag VALUES (?, ?)",
+                (
+                    (r[0], t.lower())
+                    for r in rows
+                    for t in json.loads(r[1])
+                ),
+            )
+        # Migration: idx_path duplicated the UNIQUE index and only cost writes
+        self.conn.execute("DROP INDEX IF EXISTS idx_path")
+        # Migration: databases created before artist_prefix existed
+        columns = {r[1] for r in self.conn.execute("PRAGMA table_info(songs)")}
+        if "artist_prefix" not in columns:
+            self.conn.execute("ALTER TABLE songs ADD COLUMN artist_prefix TEXT")
+            self.conn.execute("UPDATE songs SET artist_prefix = substr(artist_norm, 1, 3)")
+        if "content_key" not in columns:
+            self.conn.execute("ALTER TABLE songs ADD COLUMN content_key TEXT")
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_artist_prefix ON songs(artist_prefix)"
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_content_key ON songs(content_key)"
+        )
         self.conn.commit()
+        self._init_fts()
+
+    def _init_fts(self):
+        """Create the FTS5 index used for candidate pruning in find_match.
+
+        The virtual table mirrors songs(artist_norm, title_norm) and is kept
+        in sync via triggers. Falls back to full-table scans if the SQLite
+        build lacks FTS5.
+        """
+        try:
+            self.conn.executescript("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS songs_fts USING fts5(
+                    artist_norm, title_norm, content='songs', content_rowid='id'
+                );
+                CREATE TRIGGER IF NOT EXISTS songs_fts_ai AFTER INSERT ON songs BEGIN
+                    INSERT INTO songs_fts(rowid, artist_norm, title_norm)
+                    VALUES (new.id, new.artist_norm, new.title_norm);
+                END;
+                CREATE TRIGGER IF NOT EXISTS songs_fts_ad AFTER DELETE ON songs BEGIN
+                    INSERT INTO songs_fts(songs_fts, rowid, artist_norm, title_norm)
+                    VALUES ('delete', old.id, old.artist_norm, old.title_norm);
+                END;
+                CREATE TRIGGER IF NOT EXISTS songs_fts_au AFTER UPDATE ON songs BEGIN
+                    INSERT INTO songs_fts(songs_fts, rowid, artist_norm, title_norm)
+                    VALUES ('delete', old.id, old.artist_norm, old.title_norm);
+                    INSERT INTO songs_fts(rowid, artist_norm, title_norm)
+                    VALUES (new.id, new.artist_norm, new.title_norm);
+                END;
+            """)
+            # Backfill/repair for databases created before the FTS index
+            # existed or whose index drifted. A row count can't detect
+            # drift (external-content counts read through to songs), so
+            # ask FTS5 to verify the index against the content table
+            # (rank=1 selects the external-content comparison)
+            try:
+                self.conn.execute(
+                    "INSERT INTO songs_fts(songs_fts, rank) VALUES('integrity-check', 1)"
+                )
+            except sqlite3.DatabaseError:
+                self.conn.execute("INSERT INTO songs_fts(songs_fts) VALUES('rebuild')")
+            self.conn.commit()
+            self._fts_enabled = True
+        except sqlite3.OperationalError:
+            self._fts_enabled = False
 
     def get_song_count(self) -> int:
         return self.conn.execute("SELECT COUNT(*) FROM songs").fetchone()[0]
@@ -57,75 +178,331 @@ class SongDatabase:
         ).fetchall()
         return [dict(row) for row in rows]
 
-    def add_song(self, path: str, artist: str, title: str, mtime: float):
+    def add_song(self, path: str, artist: str, title: str, mtime: float, content_key: str = ""):
+        self._match_arrays = None
+        self._exact_maps_cache = None
+        artist_norm = normalize_text(artist)
         self.conn.execute(
             """INSERT OR REPLACE INTO songs
-               (path, artist, artist_norm, title, title_norm, mtime)
-               VALUES (?, ?, ?, ?, ?, ?)""",
-            (path, artist, normalize_text(artist), title, normalize_text(title), mtime),
+               (path, artist, artist_norm, artist_prefix, title, title_norm, mtime, content_key)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+            (
+                path,
+                artist,
+                artist_norm,
+                artist_norm[:3],
+                title,
+                normalize_text(title),
+                mtime,
+                content_key,
+            ),
         )
 
-    def remove_missing(self, existing_paths: set[str]):
-        """Remove entries for files that no longer exist."""
-        db_paths = self.get_all_paths()
-        missing = db_paths - existing_paths
-        if missing:
-            placeholders = ",".join("?" * len(missing))
-            self.conn.execute(
-                f"DELETE FROM songs WHERE path IN ({placeholders})",
-                tuple(missing),
+    def add_songs_bulk(self, rows: list[tuple[str, str, str, float, str]]):
+        """Insert many (path, artist, title, mtime, content_key) rows in one transaction.
+
+        Amortizes statement preparation and binds across the batch instead
+        of paying per-row execute overhead during scans.
+        """
+        def _expand(row):
+            path, artist, title, mtime, content_key = row
+            artist_norm = normalize_text(artist)
+            return (
+                path,
+                artist,
+                artist_norm,
+                artist_norm[:3],
+                title,
+                normalize_text(title),
+                mtime,
+                content_key,
+            )
+
+        self._match_arrays = None
+        self._exact_maps_cache = None
+        with self.conn:
+            self.conn.executemany(
+                """INSERT OR REPLACE INTO songs
+                   (path, artist, artist_norm, artist_prefix, title, title_norm, mtime, content_key)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                map(_expand, rows),
             )
 
+    def find_by_content_key(self, content_key: str) -> tuple[str, str] | None:
+        """Look up (artist, title) for a size:mtime fingerprint, if indexed."""
+        row = self.conn.execute(
+            "SELECT artist, title FROM songs WHERE content_key = ? LIMIT 1",
+            (content_key,),
+        ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def remove_missing(self, existing_paths: set[str]):
+        """Remove entries for files that no longer exist.
+
+        The set difference runs inside SQLite as an anti-join against a
+        temp table of live paths, instead of materializing every stored
+        path into Python and hitting the bound-parameter limit on large
+        deletes.
+        """
+        self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS cur_paths (path TEXT PRIMARY KEY)")
+        self.conn.execute("DELETE FROM cur_paths")
+        self.conn.executemany(
+            "INSERT INTO cur_paths VALUES (?)", ((p,) for p in existing_paths)
+        )
+        deleted = self.conn.execute(
+            "DELETE FROM songs WHERE path NOT IN (SELECT path FROM cur_paths)"
+        ).rowcount
+        if deleted:
+            self._match_arrays = None
+            self._exact_maps_cache = None
+
     def commit(self):
         self.conn.commit()
 
-    def find_match(self, artist: str, title: str) -> dict | None:
-        """Find a local song matching artist and title (fuzzy)."""
-        artist_norm = normalize_text(artist)
-        title_norm = normalize_text(title)
+    @staticmethod
+    def _fts_match_expr(terms: list[tuple[str, str]]) -> str:
+        """Build an FTS5 MATCH expression of prefix tokens.
 
-        rows = self.conn.execute(
+        Args:
+            terms: List of (column, normalized_text) pairs.
+
+        Returns:
+            Expression like 'artist_norm:"daft"* OR title_norm:"lucky"* ...',
+            or empty string if there are no usable tokens.
+        """
+        return " OR ".join(
+            part for column, text in terms if (part := _fts_column_expr(column, text))
+        )
+
+    def _fts_candidates(self, match_expr: str, limit: int = 20) -> list:
+        """Fetch the top candidate rows for an FTS5 MATCH expression."""
+        return self._find_cursor.execute(
+            _FTS_CANDIDATES_SQL, (match_expr, limit)
+        ).fetchall()
+
+    def _all_rows(self) -> list:
+        return self.conn.execute(
             "SELECT path, artist, title, artist_norm, title_norm FROM songs"
         ).fetchall()
 
+    def load_match_arrays(self) -> tuple[list, list, list, list, list]:
+        """Load the songs table as parallel columns, cached per process.
+
+        Returns (paths, artists, titles, artist_norms, title_norms). Bulk
+        matchers consume these directly so repeated lookups within one run
+        skip SQL and row materialization entirely. The cache is dropped on
+        any write.
+        """
+        if self._match_arrays is None:
+            # Plain tuples: Row wrapping is pure overhead for a columnar copy
+            cursor = self.conn.cursor()
+            cursor.row_factory = None
+            rows = cursor.execute(
+                "SELECT path, artist, title, artist_norm, title_norm FROM songs"
+            ).fetchall()
+            paths = [r[0] for r in rows]
+            artists = [r[1] for r in rows]
+            titles = [r[2] for r in rows]
+            artist_norms = [r[3] for r in rows]
+            title_norms = [r[4] for r in rows]
+            self._match_arrays = (paths, artists, titles, artist_norms, title_norms)
+        return self._match_arrays
+
+    def _exact_maps(self) -> tuple[dict, dict]:
+        """Lookup dicts for exact normalized matches, cached per process.
+
+        Returns (by_pair, by_title): (artist_norm, title_norm) -> match dict
+        and title_norm -> match dict. Most Last.fm hits normalize to an
+        exact local key, so a dict probe resolves them without any
+        similarity scoring. Rebuilt lazily after writes.
+        """
+        if self._exact_maps_cache is None:
+            paths, artists, titles, artist_norms, title_norms = self.load_match_arrays()
+            by_pair: dict = {}
+            by_title: dict = {}
+            for i in range(len(paths)):
+                match = {
+                    "path": paths[i],
+                    "artist": artists[i],
+                    "title": titles[i],
+                    "score": 1.0,
+                }
+                by_pair.setdefault((artist_norms[i], title_norms[i]), match)
+                by_title.setdefault(title_norms[i], match)
+            self._exact_maps_cache = (by_pair, by_title)
+        return self._exact_maps_cache
+
+    @staticmethod
+    def _score_candidates(rows, artist_norm: str, title_norm: str) -> dict | None:
+        """Run weighted similarity scoring over candidate rows.
+
+        Artists are scored for all rows in one batch call, titles only
+        for the rows whose artist clears the threshold.
+        """
+        if not rows:
+            return None
+
+        # Length bound: the similarity ratio can't exceed 2*min/(la+lb),
+        # so wildly different lengths are rejected without scoring
+        query_len = len(artist_norm)
+        candidates = [
+            i
+            for i, row in enumerate(rows)
+            if 2 * min(query_len, len(row["artist_norm"]))
+            >= SIMILARITY_THRESHOLD * (query_len + len(row["artist_norm"]))
+        ]
+        if not candidates:
+            return None
+
+        artist_sims = similarity_to_many(
+            artist_norm,
+            [rows[i]["artist_norm"] for i in candidates],
+            cutoff=SIMILARITY_THRESHOLD,
+        )
+        survivors = [
+            i
+            for i, sim in zip(candidates, artist_sims, strict=True)
+            if sim >= SIMILARITY_THRESHOLD
+        ]
+        if not survivors:
+            return None
+        artist_sims = dict(zip(candidates, artist_sims, strict=True))
+
+        title_sims = similarity_to_many(
+            title_norm,
+            [rows[i]["title_norm"] for i in survivors],
+            cutoff=SIMILARITY_THRESHOLD,
+        )
+
         best_match = None
         best_score = 0
 
-        for row in rows:
-            artist_sim = similarity(artist_norm, row["artist_norm"])
-            if artist_sim < SIMILARITY_THRESHOLD:
-                continue
-
-            title_sim = similarity(title_norm, row["title_norm"])
+        for i, title_sim in zip(survivors, title_sims, strict=True):
             if title_sim < SIMILARITY_THRESHOLD:
                 continue
 
             # Combined score (weighted towards title match)
-            score = artist_sim * 0.3 + title_sim * 0.7
+            score = artist_sims[i] * 0.3 + title_sim * 0.7
             if score > best_score:
                 best_score = score
+                row = rows[i]
                 best_match = {
                     "path": row["path"],
                     "artist": row["artist"],
                     "title": row["title"],
                     "score": score,
                 }
+                # A near-perfect score is a conclusive answer; nothing
+                # else can meaningfully beat it
+                if score > 0.97:
+                    break
 
         return best_match
 
-    def find_match_by_title(self, title: str, threshold: float = 0.80) -> dict | None:
-        """Find a local song matching by title only (higher threshold)."""
+    def find_match(self, artist: str, title: str) -> dict | None:
+        """Find a local song matching artist and title (fuzzy).
+
+        Uses the FTS5 index to prune candidates to a handful of rows
+        before running similarity scoring.
+        """
+        artist_norm = normalize_text(artist)
         title_norm = normalize_text(title)
 
+        # Exact normalized key: a dict probe settles the common case
+        # without touching the scorer
+        if artist_norm and title_norm:
+            exact = self._exact_maps()[0].get((artist_norm, title_norm))
+            if exact is not None:
+                return exact
+
+        # Cheap prefilter: same 3-char artist prefix covers nearly all
+        # matches above the similarity threshold and hits an index
+        rows = []
+        if artist_norm:
+            rows = self.conn.execute(
+                """SELECT path, artist, title, artist_norm, title_norm
+                   FROM songs WHERE artist_prefix = ?""",
+                (artist_norm[:3],),
+            ).fetchall()
+
+        if not rows:
+            if self._fts_enabled:
+                expr = self._fts_match_expr(
+                    [("artist_norm", artist_norm), ("title_norm", title_norm)]
+                )
+                rows = self._fts_candidates(expr) if expr else []
+            else:
+                rows = self._all_rows()
+
+        return self._score_candidates(rows, artist_norm, title_norm)
+
+    def find_matches(self, pairs: list[tuple[str, str]]) -> list[dict | None]:
+        """Find local matches for a batch of (artist, title) pairs.
+
+        Normalizes each pair once, then fetches candidates for the whole
+        batch in a single SQL round trip: a temp table of query artists
+        joined against songs on exact or 4-char-prefix artist equality.
+        Avoids one table scan per pair.
+        """
+        if not pairs:
+            return []
+
+        norm = [(normalize_text(artist), normalize_text(title)) for artist, title in pairs]
+
+        # Resolve exact normalized keys up front; only misses go through
+        # the candidate join and scorer
+        by_pair = self._exact_maps()[0]
+        results: list[dict | None] = [by_pair.get(key) for key in norm]
+        pending = [i for i, match in enumerate(results) if match is None]
+        if not pending:
+            return results
+
+        self.conn.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS match_queries (idx INTEGER, artist_norm TEXT)"
+        )
+        self.conn.execute("DELETE FROM match_queries")
+        self.conn.executemany(
+            "INSERT INTO match_queries VALUES (?, ?)",
+            [(i, norm[i][0]) for i in pending],
+        )
         rows = self.conn.execute(
-            "SELECT path, artist, title, artist_norm, title_norm FROM songs"
+            """SELECT q.idx, s.path, s.artist, s.title, s.artist_norm, s.title_norm
+               FROM match_queries q JOIN songs s
+               ON s.artist_norm = q.artist_norm
+                  OR substr(s.artist_norm, 1, 4) = substr(q.artist_norm, 1, 4)"""
         ).fetchall()
 
+        buckets: dict[int, list] = {}
+        for row in rows:
+            buckets.setdefault(row["idx"], []).append(row)
+
+        for i in pending:
+            artist_norm, title_norm = norm[i]
+            results[i] = self._score_candidates(buckets.get(i, []), artist_norm, title_norm)
+        return results
+
+    def find_match_by_title(self, title: str, threshold: float = 0.80) -> dict | None:
+        """Find a local song matching by title only (higher threshold)."""
+        title_norm = normalize_text(title)
+
+        if title_norm:
+            exact = self._exact_maps()[1].get(title_norm)
+            if exact is not None:
+                return exact
+
+        if self._fts_enabled:
+            expr = self._fts_match_expr([("title_norm", title_norm)])
+            rows = self._fts_candidates(expr) if expr else []
+        else:
+            rows = self._all_rows()
+
         best_match = None
         best_score = 0
 
-        for row in rows:
-            title_sim = similarity(title_norm, row["title_norm"])
+        title_sims = similarity_to_many(
+            title_norm, [row["title_norm"] for row in rows], cutoff=threshold
+        )
+        for row, title_sim in zip(rows, title_sims, strict=True):
             if title_sim < threshold:
                 continue
 
@@ -137,6 +514,8 @@ class SongDatabase:
                     "title": row["title"],
                     "score": title_sim,
                 }
+                if title_sim > 0.97:
+                    break
 
         return best_match
 
@@ -160,45 +539,67 @@ class SongDatabase:
             "SELECT tags FROM artist_tags WHERE artist_norm = ?", (artist_norm,)
         ).fetchone()
         if row and row[0]:
-            import json
-
             return json.loads(row[0])
         return None
 
     def set_artist_tags(self, artist_norm: str, artist: str, tags: list[str]):
-        """Cache tags for an artist."""
-        import json
-        import time
+        """Cache tags for an artist.
 
+        Tags are lowercased once here so readers never need to re-case
+        them; both the JSON column and the join table store the same
+        canonical form.
+        """
+        tags = [t.lower() for t in tags]
         self.conn.execute(
             """INSERT OR REPLACE INTO artist_tags (artist_norm, artist, tags, fetched_at)
                VALUES (?, ?, ?, ?)""",
             (artist_norm, artist, json.dumps(tags), time.time()),
         )
+        self.conn.execute("DELETE FROM artist_tag WHERE artist_norm = ?", (artist_norm,))
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO artist_tag VALUES (?, ?)",
+            ((artist_norm, t) for t in tags),
+        )
 
     def get_all_artist_tags(self) -> dict[str, list[str]]:
         """Get all cached artist tags.
 
         Returns dict mapping artist_norm -> list of tags.
         """
-        import json
-
         rows = self.conn.execute("SELECT artist_norm, tags FROM artist_tags").fetchall()
         return {r[0]: json.loads(r[1]) if r[1] else [] for r in rows}
 
     def get_artists_by_tag(self, tag: str) -> list[str]:
         """Get all artist_norm values that have a specific tag."""
-        import json
+        rows = self.conn.execute(
+            "SELECT artist_norm FROM artist_tag WHERE tag_lower = ?", (tag.lower(),)
+        ).fetchall()
+        return [r[0] for r in rows]
 
-        rows = self.conn.execute("SELECT artist_norm, tags FROM artist_tags").fetchall()
-        matching = []
-        tag_lower = tag.lower()
+    def tag_frequencies(self) -> list[tuple[str, int]]:
+        """Count artists per tag inside SQLite via the artist_tag table."""
+        rows = self.conn.execute(
+            "SELECT tag_lower, COUNT(*) FROM artist_tag GROUP BY tag_lower"
+        ).fetchall()
+        return [(r[0], r[1]) for r in rows]
+
+    def songs_by_tag(self) -> dict[str, list[dict]]:
+        """Group every song under each of its artists' tags with one JOIN.
+
+        Returns dict mapping tag_lower -> list of song dicts. One query
+        replaces the per-tag artist lookup + song fetch pair when
+        generating many playlists.
+        """
+        rows = self.conn.execute(
+            """SELECT t.tag_lower, s.path, s.artist, s.title
+               FROM artist_tag t JOIN songs s ON s.artist_norm = t.artist_norm"""
+        ).fetchall()
+        grouped: dict[str, list[dict]] = {}
         for r in rows:
-            if r[1]:
-                tags = json.loads(r[1])
-                if any(t.lower() == tag_lower for t in tags):
-                    matching.append(r[0])
-        return matching
+            grouped.setdefault(r[0], []).append(
+                {"path": r[1], "artist": r[2], "title": r[3]}
+            )
+        return grouped
 
     def get_songs_by_artist_norm(self, artist_norms: list[str]) -> list[dict]:
         """Get all songs for a list of normalized artist names."""
@@ -211,17 +612,43 @@ class SongDatabase:
         ).fetchall()
         return [dict(row) for row in rows]
 
+    def vacuum(self):
+        """Defragment and re-analyze the database after heavy rewrites."""
+        self.conn.commit()
+        self.conn.execute("VACUUM")
+        self.conn.execute("ANALYZE")
+
     def close(self):
         self.conn.close()
 
 
+# mutagen pulls in every codec it supports at import time (~100ms), so
+# defer it until the first actual tag read; commands that never scan
+# (playlist generation, tag queries, --help) skip the cost entirely
+_MutagenFile = None
+
+
+def _get_mutagen():
+    global _MutagenFile
+    if _MutagenFile is None:
+        from mutagen import File
+
+        _MutagenFile = File
+    return _MutagenFile
+
+
+# Filename-parsing patterns, compiled once rather than per file
+_TRACK_NUM_RE = re.compile(r"^\d+[\s.\-_]+")
+_ARTIST_TITLE_RE = re.compile(r"^(.+?)\s+[-–—]\s+(.+)$")
+
+
 def get_song_metadata(filepath: Path) -> tuple[str, str]:
     """Extract artist and title from audio file tags or filename."""
     artist, title = "", ""
 
     # Try reading tags
     try:
-        audio = MutagenFile(filepath, easy=True)
+        audio = _get_mutagen()(filepath, easy=True)
         if audio:
             artist = (audio.get("artist") or audio.get("albumartist") or [""])[0]
             title = (audio.get("title") or [""])[0]
@@ -232,9 +659,9 @@ def get_song_metadata(filepath: Path) -> tuple[str, str]:
     if not title:
         name = filepath.stem
         # Remove leading track numbers
-        name = re.sub(r"^\d+[\s.\-_]+", "", name)
+        name = _TRACK_NUM_RE.sub("", name)
         # Try "Artist - Title" pattern
-        match = re.match(r"^(.+?)\s+[-–—]\s+(.+)$", name)
+        match = _ARTIST_TITLE_RE.match(name)
         if match:
             if not artist:
                 artist = match.group(1).strip()
@@ -249,39 +676,108 @@ def get_song_metadata(filepath: Path) -> tuple[str, str]:
     return artist, title
 
 
+_AUDIO_SUFFIXES = {ext[1:] for ext in AUDIO_EXTENSIONS}
+
+
+def _iter_audio_files(root: Path):
+    """Yield os.DirEntry objects for audio files under root.
+
+    A single scandir traversal replaces one rglob walk per extension
+    (and per case variant), and DirEntry caches stat results from the
+    directory read on most filesystems.
+    """
+    stack = [str(root)]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    else:
+                        _, sep, ext = entry.name.rpartition(".")
+                        if sep and ext.lower() in _AUDIO_SUFFIXES:
+                            yield entry
+                except OSError:
+                    continue
+
+
 def scan_music_library(db: SongDatabase, music_dir: Path, force: bool = False) -> int:
     """Scan music directory and update database."""
     print("Scanning local music library...", end=" ", flush=True)
 
-    # Find all audio files
-    audio_files = []
-    for ext in AUDIO_EXTENSIONS:
-        audio_files.extend(music_dir.rglob(f"*{ext}"))
-        audio_files.extend(music_dir.rglob(f"*{ext.upper()}"))
+    # Find all audio files in one traversal
+    audio_files = list(_iter_audio_files(music_dir))
 
-    existing_paths = {str(f) for f in audio_files}
-
-    # Remove entries for deleted files
-    db.remove_missing(existing_paths)
+    existing_paths = {e.path for e in audio_files}
 
     # Get already indexed paths with their mtimes
     indexed = {}
     for row in db.conn.execute("SELECT path, mtime FROM songs").fetchall():
         indexed[row[0]] = row[1]
 
-    # Add/update new or modified files
-    added = 0
-    for filepath in audio_files:
-        path_str = str(filepath)
-        mtime = filepath.stat().st_mtime
+    # Collect new or modified files
+    to_update = []
+    for entry in audio_files:
+        path_str = entry.path
+        st = entry.stat()
 
         # Skip if already indexed and not modified
-        if not force and path_str in indexed and indexed[path_str] >= mtime:
+        if not force and path_str in indexed and indexed[path_str] >= st.st_mtime:
             continue
 
-        artist, title = get_song_metadata(filepath)
-        db.add_song(path_str, artist, title, mtime)
-        added += 1
+        to_update.append((Path(path_str), path_str, st.st_mtime, f"{st.st_size}:{int(st.st_mtime)}"))
+
+    # Moved/renamed files keep their size:mtime fingerprint, so their tags
+    # can be copied from the old row instead of re-parsed with mutagen.
+    # Resolved before remove_missing so the old rows are still around.
+    known_keys: dict[str, tuple[str, str]] = {}
+    if to_update and not force:
+        for row in db.conn.execute(
+            "SELECT content_key, artist, title FROM songs WHERE content_key != ''"
+        ).fetchall():
+            known_keys[row[0]] = (row[1], row[2])
+
+    moved = []
+    to_parse = []
+    for item in to_update:
+        hit = known_keys.get(item[3])
+        if hit is not None:
+            filepath, path_str, mtime, content_key = item
+            moved.append((path_str, hit[0], hit[1], mtime, content_key))
+        else:
+            to_parse.append(item)
+    if moved:
+        db.add_songs_bulk(moved)
+
+    # Tag reading is blocking file I/O (mutagen releases the GIL during
+    # reads), so farm it out to a thread pool
+    added = len(to_update)
+    if to_parse:
+        def _read_meta(item):
+            filepath, path_str, mtime, content_key = item
+            artist, title = get_song_metadata(filepath)
+            return path_str, artist, title, mtime, content_key
+
+        max_workers = min(32, (os.cpu_count() or 4) * 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as ex:
+            # Flush in chunks so huge first-time scans don't buffer the
+            # whole library in memory before writing
+            batch = []
+            for row in ex.map(_read_meta, to_parse):
+                batch.append(row)
+                if len(batch) >= 500:
+                    db.add_songs_bulk(batch)
+                    batch = []
+            if batch:
+                db.add_songs_bulk(batch)
+
+    # Remove entries for deleted files (after inserts so moved files'
+    # old rows could serve as fingerprint sources above)
+    db.remove_missing(existing_paths)
 
     db.commit()
     total = db.get_song_count()
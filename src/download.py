@@ -1,17 +1,48 @@
 """Download backends (spotdl, yt-dlp) with match verification."""
 
 import json
+import os
 import subprocess
+import sys
 import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 from .utils import normalize_text, similarity
 
+__all__ = [
+    "download_many",
+    "download_with_spotdl",
+    "download_with_ytdlp",
+    "get_spotdl_match",
+    "get_spotdl_matches",
+    "is_good_match",
+]
+
 # Similarity thresholds for match verification
 ARTIST_THRESHOLD = 0.5
 TITLE_THRESHOLD = 0.5
 TITLE_HIGH_THRESHOLD = 0.8  # Very good title match can skip artist check
 
+# Keep spotdl's throwaway save files on tmpfs where available so the
+# per-track write/read/unlink cycle never touches disk
+_TMP_DIR = "/dev/shm" if Path("/dev/shm").is_dir() else None
+
+
+def _as_match(track: dict) -> dict:
+    """Convert a spotdl save entry into our match dict."""
+    # Handle both 'artist' (string) and 'artists' (list) fields
+    artist = track.get("artist", "")
+    if not artist and track.get("artists"):
+        artists = track["artists"]
+        artist = artists[0] if isinstance(artists, list) else artists
+
+    return {
+        "artist": artist,
+        "name": track.get("name", ""),
+        "url": track.get("url", ""),
+    }
+
 
 def get_spotdl_match(query: str) -> dict | None:
     """Get what spotdl would match for a query without downloading.
@@ -22,9 +53,7 @@ def get_spotdl_match(query: str) -> dict | None:
         Dict with 'artist', 'name', 'url' keys, or None if not found.
     """
     try:
-        fd, temp_file = tempfile.mkstemp(suffix=".spotdl")
-        import os
-
+        fd, temp_file = tempfile.mkstemp(suffix=".spotdl", dir=_TMP_DIR)
         os.close(fd)
     except Exception:
         return None
@@ -47,19 +76,7 @@ def get_spotdl_match(query: str) -> dict | None:
         if not data or len(data) == 0:
             return None
 
-        track = data[0]
-
-        # Handle both 'artist' (string) and 'artists' (list) fields
-        artist = track.get("artist", "")
-        if not artist and track.get("artists"):
-            artists = track["artists"]
-            artist = artists[0] if isinstance(artists, list) else artists
-
-        return {
-            "artist": artist,
-            "name": track.get("name", ""),
-            "url": track.get("url", ""),
-        }
+        return _as_match(data[0])
 
     except subprocess.TimeoutExpired:
         return None
@@ -74,6 +91,49 @@ def get_spotdl_match(query: str) -> dict | None:
             pass
 
 
+def get_spotdl_matches(queries: list[str]) -> list[dict | None]:
+    """Resolve spotdl matches for many queries with one invocation.
+
+    Each 'spotdl save' call pays a fresh interpreter startup before any
+    work; passing every query to a single invocation amortizes that to
+    one. Entries can only be mapped back by position when every query
+    resolved, so any shortfall (or failure) falls back to per-query
+    lookups.
+    """
+    if len(queries) <= 1:
+        return [get_spotdl_match(q) for q in queries]
+
+    try:
+        fd, temp_file = tempfile.mkstemp(suffix=".spotdl", dir=_TMP_DIR)
+        os.close(fd)
+    except Exception:
+        return [get_spotdl_match(q) for q in queries]
+
+    try:
+        cmd = ["spotdl", "save", *queries, "--save-file", temp_file]
+        result = subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+            timeout=30 * len(queries),
+        )
+
+        if result.returncode == 0:
+            with open(temp_file, encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, list) and len(data) == len(queries):
+                return [_as_match(t) for t in data]
+    except Exception:
+        pass
+    finally:
+        try:
+            Path(temp_file).unlink(missing_ok=True)
+        except Exception:
+            pass
+
+    return [get_spotdl_match(q) for q in queries]
+
+
 def is_good_match(
     req_artist: str,
     req_title: str,
@@ -90,8 +150,17 @@ def is_good_match(
     match_artist_norm = normalize_text(match_artist)
     match_title_norm = normalize_text(match_title)
 
-    artist_sim = similarity(req_artist_norm, match_artist_norm)
-    title_sim = similarity(req_title_norm, match_title_norm)
+    # Exact normalized title equality is common and already clears the
+    # high-threshold acceptance on its own; skip the title scorer
+    if req_title_norm and req_title_norm == match_title_norm:
+        if req_artist_norm == match_artist_norm:
+            return True, 1.0, 1.0
+        return True, similarity(req_artist_norm, match_artist_norm), 1.0
+
+    # Scores below these floors are only ever compared against them, so
+    # let similarity() bail out early on hopeless length mismatches
+    artist_sim = similarity(req_artist_norm, match_artist_norm, cutoff=ARTIST_THRESHOLD)
+    title_sim = similarity(req_title_norm, match_title_norm, cutoff=TITLE_THRESHOLD)
 
     # Good match if both artist and title are reasonable
     if artist_sim >= ARTIST_THRESHOLD and title_sim >= TITLE_THRESHOLD:
@@ -105,16 +174,21 @@ def is_good_match(
     return False, artist_sim, title_sim
 
 
-def download_with_spotdl(artist: str, track: str, output_dir: Path) -> bool:
+# Sentinel distinguishing "no prefetched match" from "prefetch found nothing"
+_NO_PREFETCH = object()
+
+
+def download_with_spotdl(artist: str, track: str, output_dir: Path, match=_NO_PREFETCH) -> bool:
     """Download a track using spotdl with pre-verification.
 
     First checks what Spotify track spotdl would match. If the match
     seems wrong (low artist/title similarity), falls back to yt-dlp.
+    Batch callers can pass a prefetched `match` (possibly None) from
+    get_spotdl_matches to skip the per-track save call.
     """
-    query = f"{artist} - {track}"
-
-    # First, check what spotdl would match
-    match = get_spotdl_match(query)
+    # Check what spotdl would match, unless the caller already did
+    if match is _NO_PREFETCH:
+        match = get_spotdl_match(f"{artist} - {track}")
 
     if match and match.get("url"):
         is_match, artist_sim, title_sim = is_good_match(
@@ -141,6 +215,63 @@ def download_with_spotdl(artist: str, track: str, output_dir: Path) -> bool:
     return download_with_ytdlp(artist, track, output_dir)
 
 
+def download_many(
+    tracks: list[dict],
+    output_dir: Path,
+    download_fn=None,
+    workers: int = 4,
+) -> tuple[int, list[str]]:
+    """Download a batch of tracks concurrently.
+
+    Each download is an independent subprocess doing network I/O plus an
+    ffmpeg transcode, so a small thread pool overlaps them cleanly.
+    Progress is printed from the calling thread as futures complete.
+
+    Args:
+        tracks: Track dicts with 'artist' and 'name' keys.
+        output_dir: Directory to download into.
+        download_fn: Backend function (default: download_with_spotdl).
+        workers: Number of concurrent downloads.
+
+    Returns:
+        Tuple of (success_count, failed_track_names).
+    """
+    if download_fn is None:
+        download_fn = download_with_spotdl
+
+    # For the spotdl backend, resolve every match with one save call up
+    # front instead of one interpreter startup per track
+    matches = None
+    if download_fn is download_with_spotdl and len(tracks) > 1:
+        matches = get_spotdl_matches([f"{t['artist']} - {t['name']}" for t in tracks])
+
+    success = 0
+    failed = []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as ex:
+        if matches is not None:
+            futures = {
+                ex.submit(download_fn, t["artist"], t["name"], output_dir, match=m): t
+                for t, m in zip(tracks, matches, strict=True)
+            }
+        else:
+            futures = {
+                ex.submit(download_fn, t["artist"], t["name"], output_dir): t for t in tracks
+            }
+        for i, fut in enumerate(as_completed(futures), 1):
+            t = futures[fut]
+            try:
+                ok = fut.result()
+            except Exception as e:
+                print(f"  Error downloading {t['name']}: {e}", file=sys.stderr)
+                ok = False
+            print(f"[{i}/{len(tracks)}] {'Done' if ok else 'Failed'}: {t['artist']} - {t['name']}")
+            if ok:
+                success += 1
+            else:
+                failed.append(t["name"])
+    return success, failed
+
+
 def download_with_ytdlp(artist: str, track: str, output_dir: Path) -> bool:
     """Download a track using yt-dlp (YouTube search)."""
     query = f"ytsearch1:{artist} {track} official audio"
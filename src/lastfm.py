@@ -1,37 +1,153 @@
 """Last.fm API functions."""
 
+import hashlib
+import http.client
 import json
+import sqlite3
 import sys
+import threading
+import time
 import urllib.parse
-import urllib.request
 
-from .config import LASTFM_API_KEY, LASTFM_API_URL
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # orjson is optional; stdlib json handles bytes too
+    from json import loads as _json_loads
+
+# rapidfuzz is a default dependency, but process.cdist needs numpy,
+# which rapidfuzz>=3 no longer pulls in; it ships in the 'speed' extra.
+# Without it the matrix path below is skipped for the SQL fallback.
+try:
+    import numpy as _np
+    from rapidfuzz import fuzz as _rf_fuzz
+    from rapidfuzz import process as _rf_process
+except ImportError:  # pragma: no cover
+    _np = _rf_fuzz = _rf_process = None
+
+from .config import (
+    HTTP_CACHE_PATH,
+    HTTP_CACHE_TTL,
+    LASTFM_API_KEY,
+    LASTFM_API_URL,
+    SIMILARITY_THRESHOLD,
+)
 from .db import SongDatabase
+from .utils import normalize_text
 
+_API_HOST = urllib.parse.urlsplit(LASTFM_API_URL).netloc
+_API_PATH = urllib.parse.urlsplit(LASTFM_API_URL).path
+
+# On-disk response cache shared by all Last.fm callers; guarded by a lock
+# since the enrichment path fetches from worker threads
+_cache_conn: sqlite3.Connection | None = None
+_cache_lock = threading.Lock()
+
+
+def _http_cache() -> sqlite3.Connection:
+    global _cache_conn
+    if _cache_conn is None:
+        HTTP_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        _cache_conn = sqlite3.connect(str(HTTP_CACHE_PATH), check_same_thread=False)
+        _cache_conn.execute("PRAGMA journal_mode=WAL")
+        _cache_conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, body BLOB, fetched_at REAL)"
+        )
+        _cache_conn.commit()
+    return _cache_conn
 
-def get_top_tracks_by_artist(artist: str, limit: int = 20) -> list[dict]:
-    """Fetch top tracks for an artist from Last.fm API."""
-    params = {
-        "method": "artist.gettoptracks",
-        "artist": artist,
-        "api_key": LASTFM_API_KEY,
-        "format": "json",
-        "limit": limit,
-    }
-    url = f"{LASTFM_API_URL}?{urllib.parse.urlencode(params)}"
 
+def _cache_key(params: dict) -> str:
+    return hashlib.blake2b(json.dumps(params, sort_keys=True).encode()).hexdigest()
+
+
+def cache_get(params: dict) -> bytes | None:
+    """Return the cached response body for API params, or None if absent/stale."""
     try:
-        with urllib.request.urlopen(url, timeout=10) as response:
-            data = json.loads(response.read().decode())
-    except Exception as e:
+        with _cache_lock:
+            row = _http_cache().execute(
+                "SELECT body, fetched_at FROM responses WHERE key = ?", (_cache_key(params),)
+            ).fetchone()
+    except sqlite3.Error:
+        return None
+    if row and time.time() - row[1] < HTTP_CACHE_TTL:
+        return row[0]
+    return None
+
+
+def cache_put(params: dict, body: bytes):
+    """Store a successful response body for API params."""
+    try:
+        with _cache_lock:
+            conn = _http_cache()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?)",
+                (_cache_key(params), body, time.time()),
+            )
+            conn.commit()
+    except sqlite3.Error:
+        pass  # cache failures must never break a fetch
+
+# Keep-alive connection shared by all API calls in the process; a fresh
+# TLS handshake per request would otherwise dominate repeated queries
+_api_conn: http.client.HTTPSConnection | None = None
+
+
+def _lastfm_get(params: dict) -> dict | None:
+    """Issue a Last.fm API request over a reused keep-alive connection.
+
+    Returns the decoded JSON payload, or None on transport or API errors
+    (reported to stderr).
+    """
+    global _api_conn
+
+    cached = cache_get(params)
+    if cached is not None:
+        try:
+            return _json_loads(cached)
+        except ValueError:
+            pass  # corrupt cache entry; refetch
+
+    query = urllib.parse.urlencode({**params, "api_key": LASTFM_API_KEY, "format": "json"})
+    target = f"{_API_PATH}?{query}"
+
+    body = None
+    for attempt in (0, 1):
+        try:
+            if _api_conn is None:
+                _api_conn = http.client.HTTPSConnection(_API_HOST, timeout=10)
+            _api_conn.request("GET", target)
+            body = _api_conn.getresponse().read()
+            break
+        except Exception as e:
+            # Stale keep-alive connection or network error: reset, retry once
+            if _api_conn is not None:
+                _api_conn.close()
+                _api_conn = None
+            if attempt:
+                print(f"Error fetching from Last.fm: {e}", file=sys.stderr)
+                return None
+
+    try:
+        data = _json_loads(body)
+    except ValueError as e:
         print(f"Error fetching from Last.fm: {e}", file=sys.stderr)
-        return []
+        return None
 
     if "error" in data:
         print(
             f"Last.fm API error: {data.get('message', 'Unknown error')}",
             file=sys.stderr,
         )
+        return None
+
+    cache_put(params, body)
+    return data
+
+
+def get_top_tracks_by_artist(artist: str, limit: int = 20) -> list[dict]:
+    """Fetch top tracks for an artist from Last.fm API."""
+    data = _lastfm_get({"method": "artist.gettoptracks", "artist": artist, "limit": limit})
+    if data is None:
         return []
 
     tracks = data.get("toptracks", {}).get("track", [])
@@ -48,27 +164,8 @@ def get_top_tracks_by_artist(artist: str, limit: int = 20) -> list[dict]:
 
 def get_top_tracks_by_tag(tag: str, limit: int = 20) -> list[dict]:
     """Fetch top tracks for a tag/genre from Last.fm API."""
-    params = {
-        "method": "tag.gettoptracks",
-        "tag": tag,
-        "api_key": LASTFM_API_KEY,
-        "format": "json",
-        "limit": limit,
-    }
-    url = f"{LASTFM_API_URL}?{urllib.parse.urlencode(params)}"
-
-    try:
-        with urllib.request.urlopen(url, timeout=10) as response:
-            data = json.loads(response.read().decode())
-    except Exception as e:
-        print(f"Error fetching from Last.fm: {e}", file=sys.stderr)
-        return []
-
-    if "error" in data:
-        print(
-            f"Last.fm API error: {data.get('message', 'Unknown error')}",
-            file=sys.stderr,
-        )
+    data = _lastfm_get({"method": "tag.gettoptracks", "tag": tag, "limit": limit})
+    if data is None:
         return []
 
     tracks = data.get("tracks", {}).get("track", [])
@@ -85,27 +182,8 @@ def get_top_tracks_by_tag(tag: str, limit: int = 20) -> list[dict]:
 
 def search_tracks_by_title(title: str, limit: int = 20) -> list[dict]:
     """Search for tracks by title from Last.fm API."""
-    params = {
-        "method": "track.search",
-        "track": title,
-        "api_key": LASTFM_API_KEY,
-        "format": "json",
-        "limit": limit,
-    }
-    url = f"{LASTFM_API_URL}?{urllib.parse.urlencode(params)}"
-
-    try:
-        with urllib.request.urlopen(url, timeout=10) as response:
-            data = json.loads(response.read().decode())
-    except Exception as e:
-        print(f"Error fetching from Last.fm: {e}", file=sys.stderr)
-        return []
-
-    if "error" in data:
-        print(
-            f"Last.fm API error: {data.get('message', 'Unknown error')}",
-            file=sys.stderr,
-        )
+    data = _lastfm_get({"method": "track.search", "track": title, "limit": limit})
+    if data is None:
         return []
 
     tracks = data.get("results", {}).get("trackmatches", {}).get("track", [])
@@ -129,12 +207,67 @@ def check_local_matches(tracks: list[dict], db: SongDatabase, title_only: bool =
         title_only: If True, match by title only (for song title searches)
     """
     matches = 0
-    for t in tracks:
-        if title_only:
+    if title_only:
+        for t in tracks:
             match = db.find_match_by_title(t["name"])
+            if match:
+                t["local_match"] = match
+                matches += 1
+    else:
+        if _rf_process is not None:
+            results = _find_matches_cdist(tracks, db)
         else:
-            match = db.find_match(t["artist"], t["name"])
-        if match:
-            t["local_match"] = match
-            matches += 1
+            results = db.find_matches([(t["artist"], t["name"]) for t in tracks])
+        for t, match in zip(tracks, results, strict=True):
+            if match:
+                t["local_match"] = match
+                matches += 1
     return matches
+
+
+def _find_matches_cdist(tracks: list[dict], db: SongDatabase) -> list[dict | None]:
+    """Compute the full remote x local similarity matrix in one C call.
+
+    rapidfuzz.process.cdist scores every (remote, local) pair with the
+    bit-parallel scorer across all cores, replacing the per-track Python
+    loop with two threaded matrix kernels (artist and title).
+    """
+    paths, artists, titles, local_artists, local_titles = db.load_match_arrays()
+    if not paths:
+        return [None] * len(tracks)
+
+    remote_artists = [normalize_text(t["artist"]) for t in tracks]
+    remote_titles = [normalize_text(t["name"]) for t in tracks]
+
+    # score_cutoff lets the scorer skip pairs its length-band heuristic
+    # already rules out; sub-cutoff cells come back as 0 and are masked
+    # below either way
+    cutoff = SIMILARITY_THRESHOLD * 100
+    artist_scores = _rf_process.cdist(
+        remote_artists, local_artists, scorer=_rf_fuzz.ratio, score_cutoff=cutoff, workers=-1
+    )
+    title_scores = _rf_process.cdist(
+        remote_titles, local_titles, scorer=_rf_fuzz.ratio, score_cutoff=cutoff, workers=-1
+    )
+
+    # Same weighting as SongDatabase.find_match, on the 0-100 scale
+    combined = 0.3 * artist_scores + 0.7 * title_scores
+    combined[(artist_scores < cutoff) | (title_scores < cutoff)] = -1.0
+
+    results: list[dict | None] = []
+    best = _np.argmax(combined, axis=1)
+    for i in range(len(tracks)):
+        j = int(best[i])
+        score = combined[i, j]
+        if score < 0:
+            results.append(None)
+            continue
+        results.append(
+            {
+                "path": paths[j],
+                "artist": artists[j],
+                "title": titles[j],
+                "score": float(score) / 100.0,
+            }
+        )
+    return results
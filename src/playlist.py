@@ -5,16 +5,24 @@ This module provides functionality to:
 2. Generate thematic playlists based on tags
 """
 
-import json
 import os
+import threading
 import time
 import urllib.parse
 import urllib.request
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # orjson is optional; stdlib json handles bytes too
+    from json import loads as _json_loads
+
 from .config import LASTFM_API_KEY, LASTFM_API_URL, MUSIC_DIR
 from .db import SongDatabase
+from .lastfm import cache_get as lastfm_cache_get
+from .lastfm import cache_put as lastfm_cache_put
 from .utils import extract_base_artist, normalize_text
 
 # Tags to ignore (not useful for playlists)
@@ -39,29 +47,57 @@ TAG_BLACKLIST = {
 # Minimum tag count to be considered significant
 MIN_TAG_COUNT = 10
 
+# Last.fm allows 5 requests/second
+LASTFM_MAX_REQS_PER_SEC = 5
+
+
+class _RateLimiter:
+    """Token bucket spacing request starts to a fixed rate across threads."""
+
+    def __init__(self, per_second: float):
+        self._interval = 1.0 / per_second
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self._interval
+        delay = start - now
+        if delay > 0:
+            time.sleep(delay)
+
 
 def get_artist_tags_from_lastfm(artist: str) -> list[str]:
     """Fetch top tags for an artist from Last.fm API.
 
     Returns list of tag names (lowercase), sorted by popularity.
     """
-    params = {
-        "method": "artist.gettoptags",
-        "artist": artist,
-        "api_key": LASTFM_API_KEY,
-        "format": "json",
-    }
-    url = f"{LASTFM_API_URL}?{urllib.parse.urlencode(params)}"
+    cache_params = {"method": "artist.gettoptags", "artist": artist}
+    body = lastfm_cache_get(cache_params)
+    from_cache = body is not None
+
+    if body is None:
+        params = {**cache_params, "api_key": LASTFM_API_KEY, "format": "json"}
+        url = f"{LASTFM_API_URL}?{urllib.parse.urlencode(params)}"
+        try:
+            with urllib.request.urlopen(url, timeout=10) as response:
+                body = response.read()
+        except Exception:
+            return []
 
     try:
-        with urllib.request.urlopen(url, timeout=10) as response:
-            data = json.loads(response.read().decode())
-    except Exception:
+        data = _json_loads(body)
+    except ValueError:
         return []
 
     if "error" in data:
         return []
 
+    if not from_cache:
+        lastfm_cache_put(cache_params, body)
+
     tags = data.get("toptags", {}).get("tag", [])
 
     # Filter and normalize tags
@@ -120,14 +156,14 @@ def find_cached_tags_for_artist(
         if tags:  # Only inherit non-empty tags
             return tags
 
-    # Strategy 3: Prefix matching - check if this artist starts with a known artist
-    # Sort by length descending to match longest prefix first
-    for cached_norm, tags in sorted(cached_artists.items(), key=lambda x: -len(x[0])):
-        if not tags:  # Skip artists with no tags
-            continue
-        if len(cached_norm) < 3:  # Skip very short names
-            continue
-        if artist_norm.startswith(cached_norm + " "):
+    # Strategy 3: Prefix matching - check if this artist starts with a known
+    # artist. A cached name can only match as artist_norm cut at a word
+    # boundary, so probe those few prefixes longest-first with dict lookups
+    # instead of scanning (and re-sorting) the whole cache per artist.
+    i = len(artist_norm)
+    while (i := artist_norm.rfind(" ", 0, i)) >= 3:  # skip very short names
+        tags = cached_artists.get(artist_norm[:i])
+        if tags:  # only inherit non-empty tags
             return tags
 
     return None
@@ -159,7 +195,9 @@ def enrich_database_with_tags(db: SongDatabase, force: bool = False) -> int:
     inherited = 0
     failed = 0
 
-    for i, (artist_norm, artist) in enumerate(artists):
+    # First pass: resolve everything the cache can answer without the API
+    to_fetch = []
+    for artist_norm, artist in artists:
         # Check if already cached
         if not force and artist_norm in cached_artists:
             skipped += 1
@@ -170,50 +208,62 @@ def enrich_database_with_tags(db: SongDatabase, force: bool = False) -> int:
         if inherited_tags:
             db.set_artist_tags(artist_norm, artist, inherited_tags)
             cached_artists[artist_norm] = inherited_tags  # Update local cache
-            print(f"  [{i + 1}/{len(artists)}] {artist}: inherited {len(inherited_tags)} tags")
+            print(f"  {artist}: inherited {len(inherited_tags)} tags")
             inherited += 1
-            db.commit()
             continue
 
-        # Try base artist for API lookup
+        to_fetch.append((artist_norm, artist))
+    db.commit()
+
+    # Second pass: fetch the rest concurrently. The token bucket keeps
+    # aggregate request starts within the API limit while letting up to
+    # that many requests overlap in flight; DB writes stay on this thread.
+    limiter = _RateLimiter(LASTFM_MAX_REQS_PER_SEC)
+
+    def _fetch(item):
+        artist_norm, artist = item
         base_artist = extract_base_artist(artist)
         lookup_artist = base_artist if base_artist != artist else artist
 
-        print(
-            f"  [{i + 1}/{len(artists)}] Fetching tags for: {lookup_artist}...", end=" ", flush=True
-        )
-
+        limiter.wait()
         tags = get_artist_tags_from_lastfm(lookup_artist)
 
         # If base artist lookup failed but it's different, try original
         if not tags and lookup_artist != artist:
-            print("trying full name...", end=" ", flush=True)
+            limiter.wait()
             tags = get_artist_tags_from_lastfm(artist)
-            time.sleep(0.25)  # Extra rate limiting for second request
-
-        if tags:
-            db.set_artist_tags(artist_norm, artist, tags)
-            cached_artists[artist_norm] = tags  # Update local cache
-
-            # Also cache the base artist if different
-            base_norm = normalize_text(base_artist)
-            if base_norm != artist_norm and base_norm not in cached_artists:
-                db.set_artist_tags(base_norm, base_artist, tags)
-                cached_artists[base_norm] = tags
-
-            print(f"{len(tags)} tags")
-            enriched += 1
-        else:
-            # Store empty list to mark as "attempted"
-            db.set_artist_tags(artist_norm, artist, [])
-            cached_artists[artist_norm] = []
-            print("no tags found")
-            failed += 1
 
-        db.commit()
+        return artist_norm, artist, base_artist, tags
 
-        # Rate limiting: Last.fm allows 5 req/sec
-        time.sleep(0.25)
+    # Commit in batches: a per-artist commit means an fsync per artist,
+    # which dominates once responses come from the HTTP cache. The finally
+    # keeps at most ~100 fetches' worth of work uncommitted on a crash.
+    try:
+        with ThreadPoolExecutor(max_workers=LASTFM_MAX_REQS_PER_SEC) as ex:
+            for i, (artist_norm, artist, base_artist, tags) in enumerate(ex.map(_fetch, to_fetch)):
+                if tags:
+                    db.set_artist_tags(artist_norm, artist, tags)
+                    cached_artists[artist_norm] = tags  # Update local cache
+
+                    # Also cache the base artist if different
+                    base_norm = normalize_text(base_artist)
+                    if base_norm != artist_norm and base_norm not in cached_artists:
+                        db.set_artist_tags(base_norm, base_artist, tags)
+                        cached_artists[base_norm] = tags
+
+                    print(f"  [{i + 1}/{len(to_fetch)}] {artist}: {len(tags)} tags")
+                    enriched += 1
+                else:
+                    # Store empty list to mark as "attempted"
+                    db.set_artist_tags(artist_norm, artist, [])
+                    cached_artists[artist_norm] = []
+                    print(f"  [{i + 1}/{len(to_fetch)}] {artist}: no tags found")
+                    failed += 1
+
+                if (i + 1) % 100 == 0:
+                    db.commit()
+    finally:
+        db.commit()
 
     print(
         f"\nDone! Enriched: {enriched}, Inherited: {inherited}, Skipped: {skipped}, No tags: {failed}"
@@ -225,15 +275,10 @@ def get_tag_frequencies(db: SongDatabase) -> Counter:
     """Get frequency of each tag across all artists.
 
     Returns Counter mapping tag -> number of artists with that tag.
+    Counting happens inside SQLite over the normalized artist_tag table
+    instead of decoding every artist's JSON tag list in Python.
     """
-    all_tags = db.get_all_artist_tags()
-    counter: Counter = Counter()
-
-    for tags in all_tags.values():
-        for tag in tags:
-            counter[tag.lower()] += 1
-
-    return counter
+    return Counter(dict(db.tag_frequencies()))
 
 
 def generate_playlist(
@@ -260,6 +305,18 @@ def generate_playlist(
 
     # Get songs by those artists
     songs = db.get_songs_by_artist_norm(artist_norms)
+    return generate_playlist_from_songs(songs, tag, output_path)
+
+
+def generate_playlist_from_songs(songs: list[dict], tag: str, output_path: Path) -> int:
+    """Write a .m3u playlist for an already-fetched song list.
+
+    Split out of generate_playlist so bulk generation can feed it from
+    a single grouped query instead of two SQL calls per tag.
+
+    Returns:
+        Number of tracks written.
+    """
     if not songs:
         return 0
 
@@ -269,19 +326,26 @@ def generate_playlist(
     # Write .m3u file
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write("#EXTM3U\n")
-        f.write(f"# Playlist: {tag}\n")
-        f.write("# Generated by fetchfm\n")
-        f.write(f"# {len(songs)} tracks\n\n")
-
-        for song in songs:
-            # Calculate path relative to playlist file location
-            song_path = Path(song["path"])
-            rel_path = os.path.relpath(song_path, output_path.parent)
+    # Resolve the playlist directory once; per-song relpath would
+    # re-normalize (and on some platforms stat) the same base every time.
+    # Songs under it get a fast relative_to; anything else falls back.
+    base = output_path.parent.resolve()
+    lines = [
+        "#EXTM3U\n",
+        f"# Playlist: {tag}\n",
+        "# Generated by fetchfm\n",
+        f"# {len(songs)} tracks\n\n",
+    ]
+    for song in songs:
+        song_path = Path(song["path"])
+        try:
+            rel_path = song_path.relative_to(base)
+        except ValueError:
+            rel_path = os.path.relpath(song_path, base)
+        lines.append(f"#EXTINF:-1,{song['artist']} - {song['title']}\n{rel_path}\n")
 
-            f.write(f"#EXTINF:-1,{song['artist']} - {song['title']}\n")
-            f.write(f"{rel_path}\n")
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.writelines(lines)
 
     return len(songs)
 
@@ -318,6 +382,9 @@ def generate_all_playlists(
     # Sort by frequency
     popular_tags = tag_freq.most_common(max_playlists * 2)  # Get extra in case some are empty
 
+    # One grouped query covers every tag instead of two SQL calls each
+    tag_songs = db.songs_by_tag()
+
     print(f"Generating playlists in: {output_dir}")
     results = {}
 
@@ -333,13 +400,13 @@ def generate_all_playlists(
         safe_name = tag.replace("/", "-").replace("\\", "-")
         output_path = output_dir / f"{safe_name}.m3u"
 
-        count = generate_playlist(db, tag, output_path, MUSIC_DIR)
-
-        if count >= min_songs:
+        songs = tag_songs.get(tag, [])
+        if len(songs) >= min_songs:
+            count = generate_playlist_from_songs(songs, tag, output_path)
             print(f"  {tag}: {count} tracks")
             results[tag] = count
         elif output_path.exists():
-            # Remove playlist if too few songs
+            # Remove stale playlist with too few songs
             output_path.unlink()
 
     print(f"\nGenerated {len(results)} playlists")
@@ -1,8 +1,14 @@
 """Curses-based TUI for track selection."""
 
 import curses
+import json
+import os
+import select
+import socket
 import subprocess
-from pathlib import Path
+import sys
+import tempfile
+import time
 
 
 def interactive_select(tracks: list[dict], show_artist: bool = False) -> list[dict]:
@@ -12,11 +18,36 @@ def interactive_select(tracks: list[dict], show_artist: bool = False) -> list[di
         tracks: List of track dicts
         show_artist: If True, always show artist (for song title searches)
     """
-    # Determine which tracks are local
-    has_local = [bool(t.get("local_match")) for t in tracks]
-
-    # Pre-select only non-local tracks
-    selected = set(i for i, is_local in enumerate(has_local) if not is_local)
+    # Determine which tracks are local; immutable for the session, so
+    # store it as bytes and count once rather than summing every repaint
+    has_local = bytes(1 if t.get("local_match") else 0 for t in tracks)
+    has_local_count = has_local.count(1)
+
+    # Pre-select only non-local tracks; one byte per track beats a
+    # set[int] here (O(1) indexed membership, no per-index int objects,
+    # and select-all/none become single allocations)
+    selected = bytearray(0 if is_local else 1 for is_local in has_local)
+
+    # Track display text never changes during the session; build each
+    # row body (everything after the marker) once instead of redoing the
+    # slicing, comma-formatting and path splitting on every repaint
+    display = []
+    for t in tracks:
+        name = t["name"][:35]
+        if show_artist:
+            # Song title search: show artist and listeners
+            suffix = f"- {t['artist'][:18]} ({t['playcount'] or 0:,})"
+        elif t["playcount"]:
+            suffix = f"({t['playcount']:,})"
+        else:
+            suffix = f"- {t['artist'][:15]}"
+
+        if t.get("local_match"):
+            # Show album/folder name alongside
+            album = os.path.basename(os.path.dirname(t["local_match"]["path"]))[:18]
+            display.append(f"{name:<36} {suffix:<20} [{album}]")
+        else:
+            display.append(f"{name:<36} {suffix}")
 
     def run_curses(stdscr) -> list[int]:
         """Curses main loop, returns selected indices."""
@@ -34,26 +65,208 @@ def interactive_select(tracks: list[dict], show_artist: bool = False) -> list[di
         cursor = 0
         scroll_offset = 0
 
-        # Preview state
+        # Status line templates with the constant parts baked in
+        _playing_status_fmt = f" ▶ %s | %d selected | %d/{len(tracks)}"
+        _status_fmt = f" %d selected, {has_local_count} local | Track %d/{len(tracks)}"
+
+        # Preview state; the pidfd (Linux) lets the input wait wake on
+        # child exit instead of polling
         preview_proc = None
+        preview_pidfd = None
         playing_idx = None
 
+        def _close_pidfd():
+            nonlocal preview_pidfd
+            if preview_pidfd is not None:
+                os.close(preview_pidfd)
+                preview_pidfd = None
+
+        # Terminated previews awaiting reaping, as (proc, kill_deadline).
+        # stop_preview used to wait up to 1s for mpv to die, freezing the
+        # UI; instead the loop reaps these opportunistically and only
+        # escalates to SIGKILL past the deadline.
+        dying = []
+
+        # One long-lived mpv --idle daemon, driven over its JSON IPC
+        # socket, serves every preview: paying libmpv startup once per
+        # session instead of per track. If the daemon can't be spawned
+        # or its socket never comes up, previews fall back to the
+        # one-process-per-track path above permanently (ipc_failed).
+        ipc_proc = None
+        ipc_sock = None
+        ipc_buf = b""
+        ipc_failed = False
+        # end-file events the daemon will emit for our own stop commands;
+        # these must not be mistaken for the current preview finishing
+        ipc_expected_ends = 0
+        ipc_sock_path = os.path.join(
+            tempfile.gettempdir(), f"fetchfm-mpv-{os.getpid()}.sock"
+        )
+
+        def _ipc_send(command) -> bool:
+            nonlocal ipc_sock
+            if ipc_sock is None:
+                return False
+            try:
+                ipc_sock.sendall(json.dumps({"command": command}).encode() + b"\n")
+                return True
+            except OSError:
+                _teardown_ipc(kill=True)
+                return False
+
+        def _teardown_ipc(kill=False):
+            nonlocal ipc_proc, ipc_sock, ipc_buf, ipc_expected_ends
+            ipc_expected_ends = 0
+            if ipc_sock is not None:
+                try:
+                    ipc_sock.close()
+                except OSError:
+                    pass
+                ipc_sock = None
+            ipc_buf = b""
+            if ipc_proc is not None:
+                if kill and ipc_proc.poll() is None:
+                    ipc_proc.terminate()
+                    dying.append((ipc_proc, time.monotonic() + 1.0))
+                ipc_proc = None
+            try:
+                os.unlink(ipc_sock_path)
+            except OSError:
+                pass
+
+        def _ensure_ipc() -> bool:
+            nonlocal ipc_proc, ipc_sock, ipc_failed
+            if ipc_sock is not None:
+                if ipc_proc is not None and ipc_proc.poll() is None:
+                    return True
+                _teardown_ipc()  # daemon died underneath us
+            if ipc_failed:
+                return False
+            # --start/--length apply per loadfile, so baking them into
+            # the daemon's options avoids version-sensitive loadfile
+            # argument forms
+            cmd = [
+                "mpv",
+                "--idle",
+                "--no-video",
+                "--really-quiet",
+                "--start=30",
+                "--length=30",
+                f"--input-ipc-server={ipc_sock_path}",
+            ]
+            try:
+                ipc_proc = subprocess.Popen(
+                    cmd,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                )
+            except FileNotFoundError:
+                ipc_failed = True
+                return False
+            # One-time wait for the daemon to create its socket
+            deadline = time.monotonic() + 2.0
+            while time.monotonic() < deadline:
+                s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                try:
+                    s.connect(ipc_sock_path)
+                except OSError:
+                    s.close()
+                    if ipc_proc.poll() is not None:
+                        break
+                    time.sleep(0.05)
+                    continue
+                s.setblocking(False)
+                ipc_sock = s
+                return True
+            ipc_failed = True
+            _teardown_ipc(kill=True)
+            return False
+
+        def _drain_ipc_events() -> bool:
+            """Read queued daemon events; True if the preview ended."""
+            nonlocal ipc_buf, ipc_expected_ends, playing_idx
+            if ipc_sock is None:
+                return False
+            closed = False
+            while True:
+                try:
+                    data = ipc_sock.recv(4096)
+                except BlockingIOError:
+                    break
+                except OSError:
+                    closed = True
+                    break
+                if not data:
+                    closed = True
+                    break
+                ipc_buf += data
+            *lines, ipc_buf = ipc_buf.split(b"\n")
+            ends = sum(1 for line in lines if b'"end-file"' in line)
+            # Swallow the end-file events our own stop commands induced;
+            # only an unprompted one means the current preview finished
+            if ends and ipc_expected_ends:
+                consumed = min(ends, ipc_expected_ends)
+                ipc_expected_ends -= consumed
+                ends -= consumed
+            ended = ends > 0
+            if closed:
+                _teardown_ipc(kill=True)
+                ended = playing_idx is not None
+            if ended and playing_idx is not None:
+                playing_idx = None
+                return True
+            return False
+
         def stop_preview():
-            nonlocal preview_proc, playing_idx
+            nonlocal preview_proc, playing_idx, ipc_expected_ends
             if preview_proc and preview_proc.poll() is None:
                 preview_proc.terminate()
-                try:
-                    preview_proc.wait(timeout=1)
-                except subprocess.TimeoutExpired:
-                    preview_proc.kill()
+                dying.append((preview_proc, time.monotonic() + 1.0))
+            elif playing_idx is not None:
+                # Drain first: if the track already ended naturally there
+                # is nothing to stop (and no induced event to expect)
+                _drain_ipc_events()
+                if playing_idx is not None and _ipc_send(["stop"]):
+                    ipc_expected_ends += 1
+            _close_pidfd()
             preview_proc = None
             playing_idx = None
 
+        def _reap_dying():
+            still_dying = []
+            for proc, deadline in dying:
+                if proc.poll() is not None:
+                    continue
+                if time.monotonic() >= deadline:
+                    proc.kill()
+                still_dying.append((proc, deadline))
+            dying[:] = still_dying
+
+        def _shutdown_previews():
+            """Blocking cleanup for the exit paths only."""
+            stop_preview()
+            if ipc_sock is not None:
+                _ipc_send(["quit"])
+            daemon = ipc_proc
+            _teardown_ipc()
+            if daemon is not None and daemon.poll() is None:
+                dying.append((daemon, time.monotonic()))
+            for proc, _ in dying:
+                if proc.poll() is None:
+                    try:
+                        proc.wait(timeout=1)
+                    except subprocess.TimeoutExpired:
+                        proc.kill()
+            dying.clear()
+
         def start_preview(idx):
-            nonlocal preview_proc, playing_idx
+            nonlocal preview_proc, preview_pidfd, playing_idx
             stop_preview()
             t = tracks[idx]
             query = f"ytsearch1:{t['artist']} {t['name']} official audio"
+            if _ensure_ipc() and _ipc_send(["loadfile", f"ytdl://{query}", "replace"]):
+                playing_idx = idx
+                return
             cmd = [
                 "mpv",
                 "--no-video",
@@ -70,15 +283,56 @@ def interactive_select(tracks: list[dict], show_artist: bool = False) -> list[di
                 )
                 playing_idx = idx
             except FileNotFoundError:
-                pass  # mpv not installed
+                return  # mpv not installed
+            try:
+                preview_pidfd = os.pidfd_open(preview_proc.pid)
+            except (AttributeError, OSError):
+                preview_pidfd = None  # fall back to timed polling
 
-        while True:
-            # Check if preview finished
-            if preview_proc and preview_proc.poll() is not None:
-                preview_proc = None
-                playing_idx = None
+        visible_count = 0
+
+        def handle_key(key) -> str | None:
+            """Apply one key's state change.
+
+            Returns an action name ("quit", "confirm", "preview",
+            "stop") for the main loop to finish, or None when the key
+            was fully handled here.
+            """
+            nonlocal cursor, selected
+            if key == ord("q") or key == 27:  # q or ESC
+                return "quit"
+            elif key == curses.KEY_UP or key == ord("k"):
+                cursor = max(0, cursor - 1)
+            elif key == curses.KEY_DOWN or key == ord("j"):
+                cursor = min(len(tracks) - 1, cursor + 1)
+            elif key == curses.KEY_PPAGE:  # Page Up
+                cursor = max(0, cursor - visible_count)
+            elif key == curses.KEY_NPAGE:  # Page Down
+                cursor = min(len(tracks) - 1, cursor + visible_count)
+            elif key == curses.KEY_HOME:
+                cursor = 0
+            elif key == curses.KEY_END:
+                cursor = len(tracks) - 1
+            elif key == ord(" "):  # Space - toggle
+                selected[cursor] ^= 1
+                cursor = min(len(tracks) - 1, cursor + 1)
+            elif key == ord("a"):  # Select all
+                selected = bytearray(b"\x01" * len(tracks))
+            elif key == ord("n"):  # Select none
+                selected = bytearray(len(tracks))
+            elif key == ord("p"):  # Preview toggle
+                return "preview"
+            elif key == ord("s"):  # Stop preview
+                return "stop"
+            elif key == ord("\n") or key == curses.KEY_ENTER:  # Enter
+                return "confirm"
+            return None
 
-            stdscr.clear()
+        def draw():
+            """Repaint the full screen (header, track list, status bar)."""
+            nonlocal scroll_offset, visible_count
+
+            stdscr.erase()
             height, width = stdscr.getmaxyx()
 
             # Header
@@ -107,120 +361,139 @@ def interactive_select(tracks: list[dict], show_artist: bool = False) -> list[di
                 if track_idx >= len(tracks):
                     break
 
-                t = tracks[track_idx]
-                is_selected = track_idx in selected
+                is_selected = selected[track_idx]
                 is_local = has_local[track_idx]
                 is_cursor = track_idx == cursor
                 is_playing = track_idx == playing_idx
 
-                # Build the line
+                # Build the line from the prebuilt body
                 if is_playing:
-                    marker = "▶  " if is_selected else "▶  "
+                    marker = "▶  "
                 else:
                     marker = "[*]" if is_selected else "[ ]"
 
-                name = t["name"][:35]
-                if show_artist:
-                    # Song title search: show artist and listeners
-                    artist_str = t["artist"][:18]
-                    listeners = t["playcount"] or 0
-                    suffix = f"- {artist_str} ({listeners:,})"
-                elif t["playcount"]:
-                    suffix = f"({t['playcount']:,})"
-                else:
-                    suffix = f"- {t['artist'][:15]}"
-
-                if is_local:
-                    # Show album/folder name instead of title
-                    local_path = Path(t["local_match"]["path"])
-                    album = local_path.parent.name[:18]
-                    line = f"{marker} {name:<36} {suffix:<20} [{album}]"
-                else:
-                    line = f"{marker} {name:<36} {suffix}"
-
-                line = line[: width - 1]
+                line = f"{marker} {display[track_idx]}"[: width - 1]
                 y = list_start + i
 
-                # Apply styling
+                # Compose the row's attributes into one mask and pass it
+                # to addstr directly, instead of paired attron/attroff
+                # calls per style bit
                 if is_playing:
-                    stdscr.attron(curses.color_pair(4) | curses.A_BOLD)
-                elif is_cursor:
-                    stdscr.attron(curses.A_REVERSE)
-
-                if is_local and not is_playing:
-                    stdscr.attron(curses.A_DIM)
-
-                if is_selected and not is_playing:
-                    stdscr.attron(curses.color_pair(1))
+                    attr = curses.color_pair(4) | curses.A_BOLD
+                else:
+                    attr = curses.A_REVERSE if is_cursor else 0
+                    if is_local:
+                        attr |= curses.A_DIM
+                    if is_selected:
+                        attr |= curses.color_pair(1)
 
                 try:
-                    stdscr.addstr(y, 0, line)
+                    stdscr.addstr(y, 0, line, attr)
                 except curses.error:
                     pass  # Ignore if line too long
 
-                # Reset attributes
-                stdscr.attroff(curses.A_REVERSE | curses.A_DIM | curses.A_BOLD)
-                stdscr.attroff(curses.color_pair(1) | curses.color_pair(4))
-
-            # Status bar
+            # Status bar; the dirty flag already limits rebuilds to real
+            # state changes, so only the dynamic fields are formatted here
             if playing_idx is not None:
                 playing_name = tracks[playing_idx]["name"][:30]
-                status = (
-                    f" ▶ {playing_name} | {len(selected)} selected | {cursor + 1}/{len(tracks)}"
-                )
+                status = _playing_status_fmt % (playing_name, selected.count(1), cursor + 1)
             else:
-                status = f" {len(selected)} selected, {sum(has_local)} local | Track {cursor + 1}/{len(tracks)}"
+                status = _status_fmt % (selected.count(1), cursor + 1)
             try:
                 stdscr.addstr(height - 1, 0, status[: width - 1], curses.A_REVERSE)
             except curses.error:
                 pass
 
-            stdscr.refresh()
-
-            # Handle input (non-blocking check for preview updates)
-            stdscr.timeout(200)  # 200ms timeout for getch
-            key = stdscr.getch()
-
-            if key == -1:  # Timeout, no key pressed
-                continue
-
-            if key == ord("q") or key == 27:  # q or ESC
-                stop_preview()
-                return []
-            elif key == curses.KEY_UP or key == ord("k"):
-                cursor = max(0, cursor - 1)
-            elif key == curses.KEY_DOWN or key == ord("j"):
-                cursor = min(len(tracks) - 1, cursor + 1)
-            elif key == curses.KEY_PPAGE:  # Page Up
-                cursor = max(0, cursor - visible_count)
-            elif key == curses.KEY_NPAGE:  # Page Down
-                cursor = min(len(tracks) - 1, cursor + visible_count)
-            elif key == curses.KEY_HOME:
-                cursor = 0
-            elif key == curses.KEY_END:
-                cursor = len(tracks) - 1
-            elif key == ord(" "):  # Space - toggle
-                if cursor in selected:
-                    selected.discard(cursor)
-                else:
-                    selected.add(cursor)
-                cursor = min(len(tracks) - 1, cursor + 1)
-            elif key == ord("a"):  # Select all
-                selected = set(range(len(tracks)))
-            elif key == ord("n"):  # Select none
-                selected = set()
-            elif key == ord("p"):  # Preview toggle
-                if playing_idx == cursor:
+            stdscr.noutrefresh()
+            curses.doupdate()
+
+        # Only repaint when state actually changed; the 200ms poll tick
+        # otherwise skips drawing entirely (full redraws are expensive
+        # over ssh/tmux)
+        dirty = True
+
+        # The finally clause covers Ctrl-C too: the idle daemon and any
+        # dying previews must not outlive the selector
+        try:
+            while True:
+                _reap_dying()
+
+                # Check if preview finished
+                if preview_proc and preview_proc.poll() is not None:
+                    _close_pidfd()
+                    preview_proc = None
+                    playing_idx = None
+                    dirty = True
+
+                if dirty:
+                    dirty = False
+                    draw()
+
+                # Block until a key arrives, the IPC daemon reports an event,
+                # or a fallback preview child exits; with a pidfd in the set
+                # there is no reason to wake at all while idle. Platforms
+                # without pidfd_open keep a 200ms poll, but only while a
+                # fallback preview is actually playing. (A terminal resize
+                # repaints on the next wakeup.)
+                rlist = [sys.stdin]
+                timeout = None
+                if ipc_sock is not None:
+                    rlist.append(ipc_sock)
+                if preview_pidfd is not None and not dying:
+                    rlist.append(preview_pidfd)
+                elif preview_proc is not None or dying:
+                    timeout = 0.2
+                try:
+                    ready, _, _ = select.select(rlist, [], [], timeout)
+                except (OSError, ValueError):
+                    ready = rlist[:1]  # select unusable; just block on getch
+
+                if ipc_sock is not None and ipc_sock in ready:
+                    if _drain_ipc_events():
+                        dirty = True
+
+                if sys.stdin not in ready:
+                    # Woke for a preview event (or poll tick); reap up top
+                    continue
+
+                key = stdscr.getch()
+
+                if key == -1:  # Spurious wakeup
+                    continue
+
+                # Any keypress (including resize events) warrants a repaint
+                dirty = True
+
+                # Held arrows arrive in bursts; drain the queued keys and
+                # apply every state change before the single repaint.
+                # Draining stops at actions the loop must finish itself, so
+                # a preview toggle acts on the cursor's settled position
+                # rather than spawning mpv for an intermediate row
+                action = handle_key(key)
+                if action is None:
+                    stdscr.nodelay(True)
+                    try:
+                        while (key := stdscr.getch()) != -1:
+                            action = handle_key(key)
+                            if action is not None:
+                                break
+                    finally:
+                        stdscr.nodelay(False)
+
+                if action == "quit":
+                    return []
+                elif action == "confirm":
+                    return [i for i, b in enumerate(selected) if b]
+                elif action == "preview":
+                    if playing_idx == cursor:
+                        stop_preview()
+                    else:
+                        start_preview(cursor)
+                elif action == "stop":
                     stop_preview()
-                else:
-                    start_preview(cursor)
-            elif key == ord("s"):  # Stop preview
-                stop_preview()
-            elif key == ord("\n") or key == curses.KEY_ENTER:  # Enter
-                stop_preview()
-                return list(sorted(selected))
 
-        return []
+        finally:
+            _shutdown_previews()
 
     # Run curses wrapper (handles init/cleanup)
     try:
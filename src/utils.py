@@ -1,9 +1,48 @@
 """String normalization and similarity utilities."""
 
 import difflib
+import functools
 import re
 import unicodedata
 
+try:
+    from rapidfuzz import fuzz as _rf_fuzz
+except ImportError:  # pragma: no cover - rapidfuzz is in the default deps
+    _rf_fuzz = None
+
+# Precompiled suffix stripper for normalize_text (compiling per call is
+# measurable when scanning large libraries). The parenthesized and
+# dash-style variants are alternatives in one pattern so a single sub()
+# pass over the string handles both
+_SUFFIX_RE = re.compile(
+    r"\s*[\(\[][^\)\]]*?(?:radio|edit|remaster|live|version|remix|acoustic|"
+    r"feat\.?|ft\.?|bonus|extended|single|album|original|official|"
+    r"video|audio|hd|hq|\d{4})[^\)\]]*[\)\]]"
+    r"|\s*[-–—]\s*(?:remaster|live|acoustic|remix|ao vivo|remasterizado).*$",
+    re.IGNORECASE,
+)
+
+# Direct ASCII folds for the precomposed accented letters that dominate
+# real tag data (text is lowercased before this applies); one translate
+# usually leaves the string pure ASCII, skipping NFKD entirely
+_FOLD_TABLE = str.maketrans(
+    "àáâãäåçèéêëìíîïñòóôõöùúûüýÿ",
+    "aaaaaaceeeeiiiinooooouuuuyy",
+)
+
+# translate() table deleting combining marks, built on first use (BMP only,
+# which covers every combining mark seen in practice)
+_combining_table: dict[int, None] | None = None
+
+
+def _get_combining_table() -> dict[int, None]:
+    global _combining_table
+    if _combining_table is None:
+        _combining_table = dict.fromkeys(
+            cp for cp in range(0x10000) if unicodedata.combining(chr(cp))
+        )
+    return _combining_table
+
 # Patterns indicating collaborations/features (to be stripped)
 COLLAB_PATTERNS = [
     r"\s+participação\s+especial\s+.*$",
@@ -16,11 +55,23 @@ COLLAB_PATTERNS = [
     r"\s+vs\.?\s+.*$",
     r"\s+&\s+[^&]+$",  # Only strip trailing "& X" (not middle ones like "A & B")
 ]
+_COLLAB_RES = [re.compile(p, re.IGNORECASE) for p in COLLAB_PATTERNS]
+
+# Cheap lowercase substrings, at least one of which appears in any
+# string the patterns above can match; most artists contain none, and a
+# plain `in` sweep is far cheaper than nine regex scans
+_COLLAB_MARKERS = ("part", "feat", "ft.", "with", "vs", "&")
 
+_NONWORD_RE = re.compile(r"[^\w\s]+")
 
+
+@functools.lru_cache(maxsize=1 << 14)
 def extract_base_artist(artist: str) -> str:
     """Extract base artist name, removing collaboration suffixes.
 
+    Memoized like normalize_text: the same artist recurs for every one
+    of their tracks during enrichment and matching.
+
     Examples:
         "Chitãozinho & Xororó part. Zé Ramalho" -> "Chitãozinho & Xororó"
         "Daft Punk feat. Pharrell Williams" -> "Daft Punk"
@@ -28,8 +79,13 @@ def extract_base_artist(artist: str) -> str:
     """
     result = artist.strip()
 
-    for pattern in COLLAB_PATTERNS:
-        new_result = re.sub(pattern, "", result, flags=re.IGNORECASE).strip()
+    # No marker substring means no pattern can match: skip the regexes
+    low = result.lower()
+    if not any(m in low for m in _COLLAB_MARKERS):
+        return result
+
+    for pattern in _COLLAB_RES:
+        new_result = pattern.sub("", result).strip()
         # Only accept if we still have something meaningful
         if len(new_result) >= 2:
             result = new_result
@@ -37,37 +93,89 @@ def extract_base_artist(artist: str) -> str:
     return result
 
 
+@functools.lru_cache(maxsize=1 << 16)
 def normalize_text(text: str) -> str:
-    """Normalize text for fuzzy matching."""
+    """Normalize text for fuzzy matching.
+
+    Results are memoized: the same artist/title strings recur constantly
+    during scans and match sweeps.
+    """
     if not text:
         return ""
     text = text.lower()
-    # Remove common suffixes in parentheses/brackets
-    text = re.sub(
-        r"\s*[\(\[].*?(radio|edit|remaster|live|version|remix|acoustic|"
-        r"feat\.?|ft\.?|bonus|extended|single|album|original|official|"
-        r"video|audio|hd|hq|\d{4}).*?[\)\]]",
-        "",
-        text,
-        flags=re.IGNORECASE,
-    )
-    # Remove " - Remastered YYYY" style suffixes
-    text = re.sub(
-        r"\s*[-–—]\s*(remaster|live|acoustic|remix|ao vivo|remasterizado).*$",
-        "",
-        text,
-        flags=re.IGNORECASE,
-    )
-    # Normalize unicode (é -> e)
-    text = unicodedata.normalize("NFKD", text)
-    text = "".join(c for c in text if not unicodedata.combining(c))
+    # Remove common suffixes: parenthesized/bracketed qualifiers and
+    # " - Remastered YYYY" style tails, in a single scan
+    text = _SUFFIX_RE.sub("", text)
+    # Normalize unicode (é -> e); pure-ASCII strings (the common case for
+    # English track names) can skip the NFKD decomposition entirely
+    if not text.isascii():
+        # Fold the common precomposed accents directly; most non-ASCII
+        # strings become pure ASCII here and skip decomposition
+        text = text.translate(_FOLD_TABLE)
+        if not text.isascii():
+            # is_normalized is a C fast path that avoids re-decomposing
+            # strings already in NFKD form
+            if not unicodedata.is_normalized("NFKD", text):
+                text = unicodedata.normalize("NFKD", text)
+            # translate() strips the combining marks in one C pass instead
+            # of a Python-level loop with a call per character
+            text = text.translate(_get_combining_table())
     # Keep only alphanumeric and spaces
-    text = re.sub(r"[^\w\s]", " ", text)
+    text = _NONWORD_RE.sub(" ", text)
     # Collapse whitespace
     text = " ".join(text.split())
     return text
 
 
-def similarity(s1: str, s2: str) -> float:
-    """Calculate similarity ratio between two strings."""
+def similarity(s1: str, s2: str, cutoff: float = 0.0) -> float:
+    """Calculate similarity ratio between two strings.
+
+    Uses rapidfuzz's C-implemented scorer when available (~10-20x faster
+    than SequenceMatcher on the matching hot path), falling back to
+    difflib otherwise. When the caller only cares about scores at or
+    above `cutoff`, passing it lets pairs whose length difference alone
+    caps the ratio below it return 0.0 without running the scorer.
+    """
+    la, lb = len(s1), len(s2)
+    if not la or not lb:
+        return 0.0
+    # The ratio can't exceed 2*min/(la+lb): too-different lengths are a
+    # guaranteed miss for the caller's threshold
+    if cutoff and 2 * min(la, lb) < cutoff * (la + lb):
+        return 0.0
+    if _rf_fuzz is not None:
+        return _rf_fuzz.ratio(s1, s2, score_cutoff=cutoff * 100) / 100.0
     return difflib.SequenceMatcher(None, s1, s2).ratio()
+
+
+def similarity_to_many(query: str, candidates: list[str], cutoff: float = 0.0) -> list[float]:
+    """Score one query string against many candidates.
+
+    Scores known to fall below `cutoff` may be reported as 0.0, letting
+    the scorer short-circuit. In the difflib fallback, a single
+    SequenceMatcher is reused with the query as the cached second
+    sequence, so its b2j index is built once per query instead of once
+    per pair.
+    """
+    if _rf_fuzz is not None:
+        # score_cutoff lets rapidfuzz bail out via its internal length
+        # band heuristic before running the full scorer
+        score_cutoff = cutoff * 100
+        return [
+            _rf_fuzz.ratio(query, c, score_cutoff=score_cutoff) / 100.0 for c in candidates
+        ]
+    # Cheap 2-gram Jaccard filter: pairs sharing almost no bigrams can't
+    # score well, and the set intersection is far cheaper than the matcher
+    query_grams = {query[i : i + 2] for i in range(len(query) - 1)}
+    matcher = difflib.SequenceMatcher(None, "", query)
+    scores = []
+    for candidate in candidates:
+        if query_grams:
+            cand_grams = {candidate[i : i + 2] for i in range(len(candidate) - 1)}
+            union = len(query_grams | cand_grams)
+            if union and len(query_grams & cand_grams) / union < 0.3:
+                scores.append(0.0)
+                continue
+        matcher.set_seq1(candidate)
+        scores.append(matcher.ratio())
+    return scores